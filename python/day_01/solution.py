@@ -64,11 +64,23 @@ The sum of the Calories carried by these three elves is 45000.
 Find the top three Elves carrying the most Calories.
 How many Calories are those Elves carrying in total?
 """
-from dataclasses import dataclass
+import heapq
+import mmap
+import os
+import random
+import time
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice, repeat
 from pathlib import Path
+from typing import Generator, Iterable, Iterator
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Elf:
     calories: int = 0
 
@@ -83,13 +95,428 @@ def elves_and_their_calories(inputs: list[str]) -> list[Elf]:
             current = Elf()
         else:
             current.calories += int(line)
+    if inputs and inputs[-1] != "":  # the last elf isn't followed by a blank line
+        elves.append(current)
     return elves
 
 
+# ----- Compact Roster ----- #
+
+
+class ElfRoster:
+    """
+    Array-backed roster of elves, storing only their calorie totals in a typed array (8 bytes per elf).
+    Iterating or indexing gives the totals directly, Elf objects are only created on request.
+    """
+
+    __slots__ = ("totals",)
+
+    def __init__(self, totals: Iterable[int] = ()):
+        self.totals = array("q", totals)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "ElfRoster":
+        """Builds the roster from the inventory lines, same rules as elves_and_their_calories."""
+        roster = cls()
+        current, open_elf = 0, False
+        for line in lines:
+            line = line.strip()
+            if not line:
+                roster.totals.append(current)
+                current, open_elf = 0, False
+            else:
+                current += int(line)
+                open_elf = True
+        if open_elf:
+            roster.totals.append(current)
+        return roster
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.totals)
+
+    def __getitem__(self, index: int) -> int:
+        return self.totals[index]
+
+    def elf(self, index: int) -> Elf:
+        """Returns an Elf object for the elf at the given index."""
+        return Elf(self.totals[index])
+
+    def argmax(self) -> int:
+        """Returns the index of the elf carrying the most calories."""
+        return max(range(len(self.totals)), key=self.totals.__getitem__)
+
+    def top(self, k: int = 3) -> list[int]:
+        """Returns the k highest totals, in descending order."""
+        return heapq.nlargest(k, self.totals)
+
+
+# ----- Statistics ----- #
+
+
+@dataclass
+class QuantileSketch:
+    """
+    Bounded-memory quantile sketch in the spirit of KLL. Values go to a first buffer, and when a level's
+    buffer fills up it is sorted and every other value is promoted to the next level with twice the
+    weight. Memory is about capacity * log2(n / capacity) values.
+    """
+
+    capacity: int = 256
+    levels: list[list[int]] = field(default_factory=lambda: [[]])
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+
+    def add(self, value: int) -> None:
+        """Inserts a value in the sketch, compacting full levels."""
+        self.levels[0].append(value)
+        level = 0
+        while len(self.levels[level]) >= self.capacity:
+            self._compact(level)
+            level += 1
+
+    def _compact(self, level: int) -> None:
+        """Promotes half of a level's values (every other one, once sorted) to the next level."""
+        if level + 1 == len(self.levels):
+            self.levels.append([])
+        values = sorted(self.levels[level])
+        self.levels[level + 1].extend(values[self.rng.randint(0, 1) :: 2])
+        self.levels[level] = []
+
+    def quantile(self, q: float) -> int | None:
+        """Returns the approximate value at quantile q (between 0 and 1), or None if the sketch is empty."""
+        weighted = sorted((value, 1 << level) for level, values in enumerate(self.levels) for value in values)
+        if not weighted:
+            return None
+        target = q * sum(weight for _, weight in weighted)
+        cumulated = 0
+        for value, weight in weighted:
+            cumulated += weight
+            if cumulated >= target:
+                return value
+        return weighted[-1][0]
+
+
+@dataclass
+class CalorieStatistics:
+    """Single-pass statistics of the per-elf totals: count, mean, extrema, histogram and quantiles."""
+
+    bucket_width: int = 1_000
+    buckets: int = 100  # the last bucket also holds everything above the histogram range
+    count: int = 0
+    total: int = 0
+    minimum: int | None = None
+    maximum: int | None = None
+    histogram: list[int] | None = None
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def __post_init__(self):
+        self.histogram = self.histogram or [0] * self.buckets
+
+    def add(self, calories: int) -> None:
+        """Records the total of one elf."""
+        self.count += 1
+        self.total += calories
+        self.minimum = calories if self.minimum is None else min(self.minimum, calories)
+        self.maximum = calories if self.maximum is None else max(self.maximum, calories)
+        self.histogram[min(calories // self.bucket_width, self.buckets - 1)] += 1
+        self.sketch.add(calories)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentiles(self, percents: Iterable[float] = (50, 90, 99)) -> dict[float, int | None]:
+        """Returns the approximate totals at the given percentiles."""
+        return {percent: self.sketch.quantile(percent / 100) for percent in percents}
+
+
+# ----- Streaming ----- #
+
+
+@dataclass
+class TopCalories:
+    """Keeps the k highest elf totals seen so far in a bounded min-heap, fed one line at a time."""
+
+    k: int = 3
+    heap: list[int] = field(default_factory=list)
+    current: int = 0  # running total of the elf being read
+    open_elf: bool = False  # True if lines were read since the last blank one
+    elves: int = 0
+    statistics: CalorieStatistics | None = None  # also recorded if given, in the same pass
+
+    def feed(self, line: str | bytes) -> None:
+        """Processes a single line of the inventory."""
+        line = line.strip()
+        if not line:
+            self.close_elf()
+        else:
+            self.current += int(line)
+            self.open_elf = True
+
+    def close_elf(self) -> None:
+        """Pushes the running total of the current elf to the heap, and starts a new elf."""
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, self.current)
+        elif self.current > self.heap[0]:
+            heapq.heapreplace(self.heap, self.current)
+        if self.statistics is not None:
+            self.statistics.add(self.current)
+        self.elves += 1
+        self.current = 0
+        self.open_elf = False
+
+    def finish(self) -> None:
+        """Closes the last elf if the inventory didn't end with a blank line."""
+        if self.open_elf:
+            self.close_elf()
+
+    def top(self) -> list[int]:
+        """Returns the k highest totals, in descending order."""
+        return sorted(self.heap, reverse=True)
+
+    def snapshot(self, pending: int | None = None) -> list[int]:
+        """
+        Same as top, but counting the elf still being read as if the inventory ended here. A pending
+        item (e.g. from a line not yet complete) is tentatively added to that elf, without being recorded.
+        """
+        if self.open_elf or pending is not None:
+            return heapq.nlargest(self.k, [*self.heap, self.current + (pending or 0)])
+        return self.top()
+
+
+def top_calories(lines: Iterable[str], k: int = 3) -> list[int]:
+    """Returns the k highest elf totals from the lines, in descending order, in a single pass."""
+    tally = TopCalories(k=k)
+    for line in lines:
+        tally.feed(line)
+    tally.finish()
+    return tally.top()
+
+
+def stream_top_calories(path: Path, k: int = 3) -> list[int]:
+    """Same as top_calories but reads the file incrementally, never holding it in memory."""
+    with Path(path).open() as inventory:
+        return top_calories(inventory, k=k)
+
+
+def stream_calorie_statistics(path: Path, k: int = 3, **histogram) -> tuple[list[int], CalorieStatistics]:
+    """
+    Reads the inventory file incrementally once, returning both the k highest totals and the statistics
+    of all totals. Keyword arguments (bucket_width, buckets) configure the histogram.
+    """
+    tally = TopCalories(k=k, statistics=CalorieStatistics(**histogram))
+    with Path(path).open() as inventory:
+        for line in inventory:
+            tally.feed(line)
+    tally.finish()
+    return tally.top(), tally.statistics
+
+
+# ----- Follow Mode ----- #
+
+
+@dataclass
+class CalorieFollower:
+    """
+    Follows an inventory file that keeps being appended to. Each poll only reads the bytes added since
+    the previous one, and the partial last line is kept until its end arrives. As the Part 2 answer is
+    the sum of the top 3 totals, k must be at least 3.
+    """
+
+    path: Path
+    k: int = 3
+    tally: TopCalories | None = None
+    position: int = 0  # offset in the file up to which bytes were read
+    partial_line: bytes = b""
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        self.tally = self.tally or TopCalories(k=self.k)
+        if self.tally.k < 3:
+            raise ValueError("At least the top 3 totals must be kept to answer Part 2")
+
+    def poll(self) -> tuple[int, int]:
+        """Processes the newly appended bytes and returns the current Part 1 and Part 2 answers."""
+        if self.path.stat().st_size < self.position:  # file was truncated, start over
+            self.tally, self.position, self.partial_line = TopCalories(k=self.k), 0, b""
+
+        with self.path.open("rb") as inventory:
+            inventory.seek(self.position)
+            new_bytes = inventory.read()
+        self.position += len(new_bytes)
+
+        *lines, self.partial_line = (self.partial_line + new_bytes).split(b"\n")
+        for line in lines:
+            self.tally.feed(line)
+        return self.answers()
+
+    def answers(self) -> tuple[int, int]:
+        """Returns the Part 1 and Part 2 answers as if the inventory ended with the bytes read so far."""
+        partial_line = self.partial_line.strip()
+        top = self.tally.snapshot(pending=int(partial_line) if partial_line else None)
+        return (top[0] if top else 0), sum(top[:3])
+
+
+def follow(path: Path, k: int = 3, interval: float = 1.0) -> Generator[tuple[int, int], None, None]:
+    """Yields updated Part 1 and Part 2 answers each time bytes are appended to the inventory file."""
+    follower = CalorieFollower(path, k=k)
+    yield follower.poll()
+    while True:
+        time.sleep(interval)
+        if Path(path).stat().st_size != follower.position:
+            yield follower.poll()
+
+
+# ----- Vectorized ----- #
+
+
+def calorie_totals(raw: bytes) -> np.ndarray:
+    """
+    Returns the total calories of each elf from the raw bytes of the inventory. The lines are parsed
+    all at once from their digits, and summed per elf with a segmented reduction between blank lines.
+    Whitespace around a line's integer is ignored like int() does, whitespace inside the integer or any
+    other non-digit byte raises a ValueError.
+    """
+    if not raw:
+        return np.zeros(0, dtype=np.int64)
+    if not raw.endswith(b"\n"):
+        raw += b"\n"
+
+    data = np.frombuffer(raw, dtype=np.uint8)
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    if not np.isin(data[~is_digit], np.frombuffer(b" \t\r\n", dtype=np.uint8)).all():
+        raise ValueError("Inventory lines should only hold an integer, or be blank")
+    is_newline = data == ord("\n")
+    newlines = np.flatnonzero(is_newline)
+    starts = np.concatenate(([0], newlines[:-1] + 1))  # first byte of each line
+
+    # Each digit is worth digit * 10^(its distance to the last digit of its line)
+    line_of_byte = np.cumsum(is_newline) - is_newline
+    last_digits = np.maximum.reduceat(np.where(is_digit, np.arange(data.size), -1), starts)
+    first_digits = np.minimum.reduceat(np.where(is_digit, np.arange(data.size), data.size), starts)
+    digits_per_line = np.add.reduceat(is_digit, starts)
+    has_digits = last_digits != -1
+    if (last_digits - first_digits + 1 != digits_per_line)[has_digits].any():  # e.g. "12 34"
+        raise ValueError("Inventory lines should only hold an integer, or be blank")
+    exponents = last_digits[line_of_byte] - np.arange(data.size)
+    terms = np.where(is_digit, (data.astype(np.int64) - ord("0")) * 10 ** np.maximum(exponents, 0), 0)
+    values = np.add.reduceat(terms, starts)  # one value per line, 0 for blank lines
+
+    # Every blank line (no digits) closes an elf, the next one starts on the line after it
+    blanks = np.flatnonzero(~has_digits)
+    elf_starts = np.concatenate(([0], blanks + 1))
+    if elf_starts[-1] == values.size:  # inventory ended with a blank line, no elf left open
+        elf_starts = elf_starts[:-1]
+    return np.add.reduceat(values, elf_starts)
+
+
+def vectorized_top_calories(totals: np.ndarray, k: int = 3) -> np.ndarray:
+    """Returns the k highest elf totals, in descending order, with a partial partition."""
+    if totals.size > k:
+        totals = np.partition(totals, totals.size - k)[-k:]
+    return np.sort(totals)[::-1]
+
+
+# ----- Sharded ----- #
+
+
+def shard_boundaries(inventory: mmap.mmap, shards: int) -> list[int]:
+    """
+    Splits the memory-mapped inventory in about equal shards, moving each cut right after the next
+    blank line (LF or CRLF) so that no elf is split across two shards. Returns the start offsets plus
+    the end.
+    """
+    size = len(inventory)
+    boundaries = [0]
+    for nominal in range(size // shards, size, max(size // shards, 1)):
+        if nominal <= boundaries[-1]:
+            continue
+        cuts = [
+            blank + len(separator)
+            for separator in (b"\n\n", b"\r\n\r\n")
+            if (blank := inventory.find(separator, nominal - len(separator) + 1)) != -1
+        ]
+        if not cuts:  # no elf starts after this point
+            break
+        boundaries.append(min(cuts))
+    if boundaries[-1] != size:
+        boundaries.append(size)
+    return boundaries
+
+
+def _shard_top_calories(path: Path, start: int, end: int, k: int) -> tuple[int, list[int]]:
+    """Worker: returns the number of elves and the local top-k of the [start, end) bytes of the file."""
+    tally = TopCalories(k=k)
+    with Path(path).open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as inventory:
+        inventory.seek(start)
+        while inventory.tell() < end:
+            tally.feed(inventory.readline())
+    tally.finish()
+    return tally.elves, tally.top()
+
+
+def sharded_top_calories(path: Path, k: int = 3, workers: int | None = None) -> list[int]:
+    """
+    Memory-maps the inventory, splits it in shards aligned on elf boundaries and gets the top-k of
+    each shard in its own worker process. The local results are then merged in the global top-k.
+    """
+    workers = workers or os.cpu_count() or 1
+    if Path(path).stat().st_size == 0:  # can't mmap an empty file
+        return []
+    with Path(path).open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as inventory:
+        boundaries = shard_boundaries(inventory, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            _shard_top_calories,
+            [path] * (len(boundaries) - 1),
+            boundaries[:-1],
+            boundaries[1:],
+            [k] * (len(boundaries) - 1),
+        )
+        return heapq.nlargest(k, (total for _, local_top in results for total in local_top))
+
+
+# ----- Multiple Inventories ----- #
+
+
+@dataclass
+class InventorySummary:
+    """The result of aggregating a single inventory file."""
+
+    path: Path
+    elves: int
+    top: list[int]  # the file's k highest totals, in descending order
+    runtime: float  # in seconds
+
+
+def _summarize_inventory(path: Path, k: int) -> InventorySummary:
+    """Worker: streams a single inventory file and keeps only its top-k totals."""
+    start = time.perf_counter()
+    tally = TopCalories(k=k)
+    with Path(path).open() as inventory:
+        for line in inventory:
+            tally.feed(line)
+    tally.finish()
+    return InventorySummary(Path(path), tally.elves, tally.top(), time.perf_counter() - start)
+
+
+def merge_inventories(
+    paths: Iterable[Path], k: int = 3, workers: int | None = None
+) -> tuple[list[int], list[InventorySummary]]:
+    """
+    Aggregates each inventory file in a worker pool, keeping only the top-k of each file, then k-way
+    merges these small sorted results. Returns the global top-k and the summary of every file.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(_summarize_inventory, paths, repeat(k), chunksize=16))
+    merged = heapq.merge(*(summary.top for summary in summaries), reverse=True)
+    return list(islice(merged, k)), summaries
+
+
 if __name__ == "__main__":
-    inputs = Path("input.txt").read_text().splitlines()
-    elves = elves_and_their_calories(inputs)
-    calories = [elf.calories for elf in elves]
-    top3_calories = sorted(calories, reverse=True)[:3]
-    print("Part 1: ", max(calories))
+    top3_calories = stream_top_calories(Path("input.txt"), k=3)
+    print("Part 1: ", top3_calories[0])
     print("Part 2: ", sum(top3_calories))
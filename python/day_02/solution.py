@@ -54,8 +54,11 @@ Now that you're correctly decrypting the ultra top secret strategy guide, you wo
 
 Following the Elf's instructions for the second column, what would your total score be if everything goes exactly according to your strategy guide?
 """
+from itertools import permutations
 from pathlib import Path
 
+import numpy as np
+
 # ----- For Part 1 ----- #
 
 shape_to_points = {"rock": 1, "paper": 2, "scissors": 3}
@@ -117,6 +120,127 @@ def find_own_shape(opponent_shape: str, outcome: str) -> str:
             return "paper"
 
 
+# ----- Table-Driven ----- #
+
+
+def strategies_scores(opponent_letter: str, second_letter: str) -> tuple[int, int]:
+    """Returns the score of a round line when read with the Part 1 and with the Part 2 strategies."""
+    opponent_shape = letter_to_shape[opponent_letter.lower()]
+
+    own_shape = letter_to_shape[second_letter.lower()]
+    part1 = round_score(own_shape, round_outcome(opponent_shape, own_shape))
+
+    own_shape = find_own_shape(opponent_shape, letter_to_outcome[second_letter.lower()])
+    part2 = round_score(own_shape, round_outcome(opponent_shape, own_shape))
+    return part1, part2
+
+
+# There are only 9 possible round lines, so both scores are computed once for each of them
+line_to_scores = {
+    f"{opponent} {second}".encode(): strategies_scores(opponent, second)
+    for opponent in "ABC"
+    for second in "XYZ"
+}
+
+
+def lines_histogram(raw: bytes) -> dict[bytes, int]:
+    """
+    Counts the occurrences of each of the 9 possible round lines directly in the raw input bytes. Raises a
+    ValueError if any non-blank line is not exactly one of them.
+    """
+    raw = raw.upper().replace(b"\r", b"")
+    histogram = {line: raw.count(line) for line in line_to_scores}
+
+    # Each round line is 4 bytes with its newline: if there are as many matches as non-blank lines and
+    # these lines add up to 4 bytes each, every line is exactly one match
+    lines = raw.removesuffix(b"\n").split(b"\n") if raw else []
+    rounds = len(lines) - lines.count(b"")
+    rounds_bytes = len(raw) + (not raw.endswith(b"\n")) - (len(lines) - rounds)  # blank lines are 1 byte
+    if sum(histogram.values()) != rounds or (rounds and rounds_bytes != 4 * rounds):
+        raise ValueError("Every round line should be an opponent letter and a second letter, like 'A X'")
+    return histogram
+
+
+def total_scores(raw: bytes) -> tuple[int, int]:
+    """Returns the Part 1 and Part 2 total scores, doing work per distinct line rather than per round."""
+    histogram = lines_histogram(raw)
+    part1 = sum(count * line_to_scores[line][0] for line, count in histogram.items())
+    part2 = sum(count * line_to_scores[line][1] for line, count in histogram.items())
+    return part1, part2
+
+
+# ----- All Letter Mappings ----- #
+
+
+def letter_pairs_histogram(raw: bytes) -> dict[tuple[str, str], int]:
+    """Returns the 3x3 histogram of (opponent letter, second letter) pairs, e.g. {("a", "x"): 3, ...}."""
+    return {
+        (line[:1].decode().lower(), line[2:].decode().lower()): count
+        for line, count in lines_histogram(raw).items()
+    }
+
+
+def all_mappings_scores(raw: bytes) -> tuple[dict[tuple[str, ...], int], dict[tuple[str, ...], int]]:
+    """
+    Reads the guide once and returns the total score under every interpretation of X, Y and Z: first as
+    each of the 6 permutations of shapes, then as each of the 6 permutations of outcomes. Keys are the
+    interpretation of (X, Y, Z), e.g. ("rock", "paper", "scissors") is the Part 1 mapping.
+    """
+    histogram = letter_pairs_histogram(raw)
+
+    shape_mappings_scores = {}
+    for shapes in permutations(["rock", "paper", "scissors"]):
+        mapping = dict(zip("xyz", shapes))
+        shape_mappings_scores[shapes] = sum(
+            count * round_score(mapping[second], round_outcome(letter_to_shape[opponent], mapping[second]))
+            for (opponent, second), count in histogram.items()
+        )
+
+    outcome_mappings_scores = {}
+    for outcomes in permutations(["loss", "draw", "win"]):
+        mapping = dict(zip("xyz", outcomes))
+        score = 0
+        for (opponent, second), count in histogram.items():
+            own_shape = find_own_shape(letter_to_shape[opponent], mapping[second])
+            score += count * round_score(own_shape, mapping[second])
+        outcome_mappings_scores[outcomes] = score
+
+    return shape_mappings_scores, outcome_mappings_scores
+
+
+# ----- Vectorized ----- #
+
+
+def vectorized_total_scores(raw: bytes) -> tuple[int, int]:
+    """
+    Returns the Part 1 and Part 2 total scores with whole-array operations. Every round line is 4 bytes
+    ("A X\n"), so the opponent and second columns are strided views of the input as a uint8 array.
+    Shapes and outcomes are encoded as 0..2 codes, for which the round outcome is a modular difference.
+    """
+    raw = raw.upper().replace(b"\r", b"")
+    if raw and not raw.endswith(b"\n"):
+        raw += b"\n"
+    data = np.frombuffer(raw, dtype=np.uint8)
+    if data.size % 4:
+        raise ValueError("Every round line should be made of exactly 4 bytes, like 'A X\\n'")
+
+    opponent = data[0::4].astype(np.int64) - ord("A")  # 0: rock, 1: paper, 2: scissors
+    second = data[2::4].astype(np.int64) - ord("X")
+    known_letters = np.isin(opponent, (0, 1, 2)) & np.isin(second, (0, 1, 2))
+    separators = (data[1::4] == ord(" ")) & (data[3::4] == ord("\n"))
+    if not (known_letters & separators).all():
+        raise ValueError("Every round line should be an opponent letter and a second letter, like 'A X'")
+
+    # Part 1: second column is our shape, outcome is 0: loss, 1: draw, 2: win
+    outcome = (second - opponent + 1) % 3
+    part1 = (second + 1 + 3 * outcome).sum()
+
+    # Part 2: second column is the outcome, our shape is offset from the opponent's
+    own_shape = (opponent + second - 1) % 3
+    part2 = (own_shape + 1 + 3 * second).sum()
+    return int(part1), int(part2)
+
+
 if __name__ == "__main__":
     rounds = Path("input.txt").read_text().splitlines()
 
@@ -75,7 +75,16 @@ The sum of these is 70.
 Find the item type that corresponds to the badges of each three-Elf group.
 What is the sum of the priorities of those item types?
 """
+import os
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import reduce
+from itertools import islice
+from operator import or_
 from pathlib import Path
+from typing import BinaryIO, Iterator
+
+import numpy as np
 
 # ----- For Part 1 ----- #
 
@@ -105,6 +114,120 @@ def common_items_three_rucksacks(rucksack_1: str, rucksack_2: str, rucksack_3: s
     return list(set(rucksack_1) & set(rucksack_2) & set(rucksack_3))[0]  # ok as there is only one
 
 
+# ----- Bitmask Engine ----- #
+
+# this gives, for each byte value, the bit of its priority: 1 << 0 for b"a", ..., 1 << 51 for b"Z", 0 otherwise
+byte_to_bit = [
+    1 << (letter_to_priority[chr(byte)] - 1) if chr(byte) in letter_to_priority else 0 for byte in range(256)
+]
+
+
+def items_mask(items: bytes) -> int:
+    """Returns the 52-bit mask of the item types present in the items."""
+    return reduce(or_, map(byte_to_bit.__getitem__, items), 0)
+
+
+def mask_priority(mask: int) -> int:
+    """Returns the priority of the (single) item type in the mask, from its bit position."""
+    return mask.bit_length()
+
+
+def bitmask_priorities(raw: bytes) -> tuple[int, int]:
+    """Returns the Part 1 and Part 2 sums of priorities, intersecting item masks with & instead of sets."""
+    rucksacks = raw.split()
+    part1 = 0
+    for rucksack in rucksacks:
+        half = len(rucksack) // 2
+        part1 += mask_priority(items_mask(rucksack[:half]) & items_mask(rucksack[half:]))
+
+    part2 = 0
+    masks = map(items_mask, rucksacks)
+    for mask_1, mask_2, mask_3 in zip(masks, masks, masks):  # consumes the masks by groups of 3
+        part2 += mask_priority(mask_1 & mask_2 & mask_3)
+    return part1, part2
+
+
+# ----- Streaming ----- #
+
+
+def group_aligned_chunks(file: BinaryIO, groups_per_chunk: int) -> Iterator[bytes]:
+    """Reads the rucksacks incrementally, yielding chunks made of whole groups of 3 lines."""
+    while chunk := b"".join(islice(file, 3 * groups_per_chunk)):
+        yield chunk
+
+
+def stream_priorities(
+    path: Path, groups_per_chunk: int = 10_000, workers: int | None = None
+) -> tuple[int, int]:
+    """
+    Returns the Part 1 and Part 2 sums of priorities, reading the file in group-aligned chunks that are
+    processed by a pool of workers. At most 2 chunks per worker are in flight, so memory stays constant.
+    """
+    workers = workers or os.cpu_count() or 1
+    part1, part2 = 0, 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, Path(path).open("rb") as file:
+        in_flight = set()
+        for chunk in group_aligned_chunks(file, groups_per_chunk):
+            if len(in_flight) >= 2 * workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_part1, chunk_part2 = future.result()
+                    part1, part2 = part1 + chunk_part1, part2 + chunk_part2
+            in_flight.add(pool.submit(bitmask_priorities, chunk))
+        for future in in_flight:
+            chunk_part1, chunk_part2 = future.result()
+            part1, part2 = part1 + chunk_part1, part2 + chunk_part2
+    return part1, part2
+
+
+# ----- Vectorized ----- #
+
+# this gives, for each byte value, the column of its item type in the presence matrices (-1 if not an item)
+byte_to_column = np.array([bit.bit_length() - 1 for bit in byte_to_bit], dtype=np.int64)
+
+
+def presence_matrices(raw: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns two (N, 52) boolean matrices telling which item types are present in the first and in the
+    second compartment of each of the N rucksacks, built from the raw bytes without a Python loop.
+    Blank lines are dropped.
+    """
+    raw = raw.replace(b"\r", b"")
+    if raw and not raw.endswith(b"\n"):
+        raw += b"\n"
+    data = np.frombuffer(raw, dtype=np.uint8)
+    is_newline = data == ord("\n")
+    newlines = np.flatnonzero(is_newline)
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+
+    rucksack_of_byte = np.cumsum(is_newline) - is_newline
+    position_in_line = np.arange(data.size) - starts[rucksack_of_byte]
+    half_lengths = (newlines - starts) // 2
+    columns = byte_to_column[data]
+    is_item = columns >= 0
+    in_first_half = position_in_line < half_lengths[rucksack_of_byte]
+
+    first = np.zeros((newlines.size, 52), dtype=bool)
+    second = np.zeros((newlines.size, 52), dtype=bool)
+    first_items, second_items = is_item & in_first_half, is_item & ~in_first_half
+    first[rucksack_of_byte[first_items], columns[first_items]] = True
+    second[rucksack_of_byte[second_items], columns[second_items]] = True
+
+    is_rucksack = np.zeros(newlines.size, dtype=bool)  # blank lines are not rucksacks
+    is_rucksack[rucksack_of_byte[is_item]] = True
+    return first[is_rucksack], second[is_rucksack]
+
+
+def vectorized_priorities(raw: bytes) -> tuple[int, int]:
+    """Returns the Part 1 and Part 2 sums of priorities from whole-matrix operations."""
+    first, second = presence_matrices(raw)
+    common = first & second
+    part1 = (common.argmax(axis=1) + 1) * common.any(axis=1)  # 0 if there is no common item
+    badges = (first | second).reshape(-1, 3, 52).all(axis=1)  # groups of 3 rucksacks
+    part2 = (badges.argmax(axis=1) + 1) * badges.any(axis=1)
+    return int(part1.sum()), int(part2.sum())
+
+
 # ----- Running ----- #
 
 if __name__ == "__main__":
@@ -65,7 +65,12 @@ So, in this example, the number of overlapping assignment pairs is 4.
 
 In how many assignment pairs do the ranges overlap?
 """
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
 
 # ----- For Part 1 ----- #
 
@@ -82,7 +87,174 @@ def elf_sections(input_line: str) -> tuple[set[int], set[int]]:
     return elf1_sections, elf2_sections
 
 
-# ----- For Part 2 ----- #
+# ----- Intervals (Both Parts) ----- #
+
+
+@dataclass(frozen=True)
+class Sections:
+    """An elf's assignment as its inclusive endpoints, no matter how many sections it spans."""
+
+    start: int
+    end: int
+
+    def contains(self, other: "Sections") -> bool:
+        """Returns True if the other assignment is fully within this one."""
+        return self.start <= other.start and other.end <= self.end
+
+    def overlaps(self, other: "Sections") -> bool:
+        """Returns True if the two assignments share at least one section."""
+        return self.start <= other.end and other.start <= self.end
+
+
+def elf_intervals(input_line: str) -> tuple[Sections, Sections]:
+    """Parses a line from the input once, returns the assignments of the 2 elves as intervals."""
+    elf1, elf2 = input_line.split(",")
+    start1, end1 = elf1.split("-")
+    start2, end2 = elf2.split("-")
+    return Sections(int(start1), int(end1)), Sections(int(start2), int(end2))
+
+
+# ----- Sections Index ----- #
+
+
+@dataclass
+class IntervalNode:
+    """A node of a centered interval tree, holding the assignments that contain its center."""
+
+    center: int
+    by_start: list[Sections]  # assignments containing the center, by increasing start
+    by_end: list[Sections]  # same assignments, by decreasing end
+    left: "IntervalNode | None" = None
+    right: "IntervalNode | None" = None
+
+    @classmethod
+    def build(cls, assignments: list[Sections]) -> "IntervalNode | None":
+        """Recursively builds the tree, centering each node on the median endpoint of its assignments."""
+        if not assignments:
+            return None
+        endpoints = sorted(
+            endpoint for sections in assignments for endpoint in (sections.start, sections.end)
+        )
+        center = endpoints[len(endpoints) // 2]
+        here = [sections for sections in assignments if sections.start <= center <= sections.end]
+        return cls(
+            center=center,
+            by_start=sorted(here, key=lambda sections: sections.start),
+            by_end=sorted(here, key=lambda sections: sections.end, reverse=True),
+            left=cls.build([sections for sections in assignments if sections.end < center]),
+            right=cls.build([sections for sections in assignments if sections.start > center]),
+        )
+
+    def stab(self, section: int) -> Iterator[Sections]:
+        """Yields the assignments containing the given section."""
+        node = self
+        while node is not None:
+            if section < node.center:
+                for sections in node.by_start:
+                    if sections.start > section:
+                        break
+                    yield sections
+                node = node.left
+            elif section > node.center:
+                for sections in node.by_end:
+                    if sections.end < section:
+                        break
+                    yield sections
+                node = node.right
+            else:
+                yield from node.by_start
+                return
+
+
+@dataclass
+class SectionsIndex:
+    """
+    Index over many assignments: sorted starts and ends answer depth and overlap counts by bisection in
+    O(log n), and a centered interval tree lists the assignments covering a section in O(log n + k).
+    """
+
+    assignments: list[Sections]
+    starts: list[int] = field(init=False)
+    ends: list[int] = field(init=False)
+    tree: IntervalNode | None = field(init=False)
+
+    def __post_init__(self):
+        self.starts = sorted(sections.start for sections in self.assignments)
+        self.ends = sorted(sections.end for sections in self.assignments)
+        self.tree = IntervalNode.build(self.assignments)
+
+    @classmethod
+    def from_lines(cls, input_lines: Iterable[str]) -> "SectionsIndex":
+        """Indexes the assignments of both elves of every line."""
+        return cls([sections for line in input_lines for sections in elf_intervals(line)])
+
+    def depth(self, section: int) -> int:
+        """Returns how many elves are assigned the given section."""
+        return bisect_right(self.starts, section) - bisect_left(self.ends, section)
+
+    def stab(self, section: int) -> list[Sections]:
+        """Returns the assignments that include the given section."""
+        return list(self.tree.stab(section)) if self.tree is not None else []
+
+    def count_overlapping(self, query: Sections) -> int:
+        """Returns how many assignments share at least one section with the query range."""
+        ends_before = bisect_left(self.ends, query.start)
+        starts_after = len(self.starts) - bisect_right(self.starts, query.end)
+        return len(self.assignments) - ends_before - starts_after
+
+    def coverage_profile(self) -> list[tuple[int, int, int]]:
+        """
+        Returns (first, last, depth) runs of sections with the same coverage depth, from the lowest to
+        the highest assigned section. Runs with a depth of 0 are the uncovered sections.
+        """
+        events = sorted(
+            [(sections.start, 1) for sections in self.assignments]
+            + [(sections.end + 1, -1) for sections in self.assignments]
+        )
+        profile, depth = [], 0
+        for i, (position, change) in enumerate(events):
+            depth += change
+            next_position = events[i + 1][0] if i + 1 < len(events) else position
+            if next_position > position:  # all changes at this position were applied
+                profile.append((position, next_position - 1, depth))
+        return profile
+
+    def uncovered(self) -> list[tuple[int, int]]:
+        """Returns the (first, last) runs of sections assigned to no elf, between the assigned ones."""
+        return [(first, last) for first, last, depth in self.coverage_profile() if depth == 0]
+
+
+# ----- Vectorized ----- #
+
+
+def parse_assignments(raw: bytes) -> np.ndarray:
+    """
+    Returns an (N, 4) array with the start and end of both elves' assignments for each of the N lines.
+    All integers are parsed at once from the raw bytes: each digit is worth digit * 10^(its distance to
+    the end of its number), and these terms are summed per number.
+    """
+    data = np.frombuffer(raw + b"\n", dtype=np.uint8)
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    follows_digit = np.concatenate(([False], is_digit[:-1]))
+    starts = np.flatnonzero(is_digit & ~follows_digit)  # first digit of each number
+    ends = np.flatnonzero(~is_digit & follows_digit) - 1  # last digit of each number
+    if starts.size % 4:
+        raise ValueError("Every line should hold 4 integers, like '2-4,6-8'")
+    if not starts.size:
+        return np.zeros((0, 4), dtype=np.int64)
+
+    number_of_byte = np.cumsum(is_digit & ~follows_digit) - 1
+    exponents = ends[np.maximum(number_of_byte, 0)] - np.arange(data.size)
+    terms = np.where(is_digit, (data.astype(np.int64) - ord("0")) * 10 ** np.maximum(exponents, 0), 0)
+    return np.add.reduceat(terms, starts).reshape(-1, 4)
+
+
+def vectorized_overlaps(assignments: np.ndarray) -> tuple[int, int]:
+    """Returns the number of pairs where one assignment fully contains the other, and where they overlap."""
+    start1, end1, start2, end2 = assignments.T
+    contained = ((start1 <= start2) & (end2 <= end1)) | ((start2 <= start1) & (end1 <= end2))
+    overlapping = (start1 <= end2) & (start2 <= end1)
+    return int(contained.sum()), int(overlapping.sum())
 
 
 # ----- Running ----- #
@@ -90,18 +262,12 @@ def elf_sections(input_line: str) -> tuple[set[int], set[int]]:
 if __name__ == "__main__":
     sections = Path("input.txt").read_text().splitlines()
 
-    # Part 1
-    overlaps = 0
-    for line in sections:
-        elf1, elf2 = elf_sections(line)
-        if elf1.issubset(elf2) or elf2.issubset(elf1):
-            overlaps += 1
-    print("Part 1:", overlaps)
-
-    # Part 2
-    overlaps = 0
+    full_overlaps, overlaps = 0, 0
     for line in sections:
-        elf1, elf2 = elf_sections(line)
-        if elf1.intersection(elf2):  # the intersection isn't empty
+        elf1, elf2 = elf_intervals(line)
+        if elf1.contains(elf2) or elf2.contains(elf1):
+            full_overlaps += 1
+        if elf1.overlaps(elf2):
             overlaps += 1
+    print("Part 1:", full_overlaps)
     print("Part 2:", overlaps)
@@ -119,9 +119,11 @@ In this example, the CrateMover 9001 has put the crates in a totally different o
 Before the rearrangement process finishes, update your simulation so that the Elves know where they should stand to be ready to unload the final supplies.
 After the rearrangement procedure completes, what crate ends up on top of each stack?
 """
+import random
 import re
 
 from copy import deepcopy
+from dataclasses import dataclass, field
 from pathlib import Path
 
 # ----- For Part 1 ----- #
@@ -190,26 +192,270 @@ def move_part2(stacks: dict[int, str], instruction: str):
     return staks
 
 
+# ----- In-Place Engine ----- #
+
+
+def load_crate_lists(input_lines: list[str]) -> dict[int, list[str]]:
+    """Same as load_crates_positions but each stack is a mutable list, with the top crate last."""
+    return {idx: list(stack) for idx, stack in load_crates_positions(input_lines).items()}
+
+
+def crane_move(
+    stacks: dict[int, list[str]], instruction: str, multiple: bool = False, copy: bool = False
+) -> dict[int, list[str]]:
+    """
+    Does the move instruction on list-backed stacks, in place. With multiple=False the crates are moved
+    one at a time (Part 1), with multiple=True they are moved all at once (Part 2). If copy=True, the
+    given stacks are left untouched and the new state is returned as a snapshot.
+    """
+    if copy:
+        stacks = {idx: list(stack) for idx, stack in stacks.items()}  # crates are str, shallow is enough
+    quantity, start_position, end_position = parse_move_instruction(instruction)
+
+    split = len(stacks[start_position]) - quantity
+    cargo = stacks[start_position][split:]
+    del stacks[start_position][split:]
+    stacks[end_position].extend(cargo if multiple else reversed(cargo))  # one at a time reverses the order
+    return stacks
+
+
+# ----- Rope Engine ----- #
+
+
+@dataclass(slots=True, eq=False)
+class RopeNode:
+    """
+    Node of an implicit treap (ordered by position, heap-ordered by priority) holding a run of crates
+    as indices into a shared string, so runs are never copied. Subtree reversals are applied lazily.
+    """
+
+    crates: str
+    lo: int
+    hi: int  # the node holds crates[lo:hi]
+    priority: float
+    left: "RopeNode | None" = None
+    right: "RopeNode | None" = None
+    size: int = 0  # number of crates in the subtree
+    backwards: bool = False  # the node's own run is read from hi - 1 down to lo
+    flipped: bool = False  # pending reversal of the whole subtree
+
+    def __post_init__(self):
+        self.update()
+
+    def update(self) -> None:
+        self.size = (self.hi - self.lo) + _size(self.left) + _size(self.right)
+
+    def push(self) -> None:
+        """Applies a pending reversal to this node and hands it down to the children."""
+        if self.flipped:
+            self.left, self.right = self.right, self.left
+            self.backwards = not self.backwards
+            for child in (self.left, self.right):
+                if child is not None:
+                    child.flipped = not child.flipped
+            self.flipped = False
+
+
+def _size(node: RopeNode | None) -> int:
+    return node.size if node is not None else 0
+
+
+def rope_split(node: RopeNode | None, count: int) -> tuple[RopeNode | None, RopeNode | None]:
+    """Splits the rope in its first count crates (bottom of the stack) and the rest, in O(log n)."""
+    if node is None:
+        return None, None
+    node.push()
+    left_size, run_length = _size(node.left), node.hi - node.lo
+
+    if count <= left_size:
+        first, node.left = rope_split(node.left, count)
+        node.update()
+        return first, node
+    if count >= left_size + run_length:
+        node.right, rest = rope_split(node.right, count - left_size - run_length)
+        node.update()
+        return node, rest
+
+    # The cut is inside this node's run: it keeps the first part, a new node takes the second
+    cut = count - left_size
+    if node.backwards:
+        first_lo, first_hi, second_lo, second_hi = node.hi - cut, node.hi, node.lo, node.hi - cut
+    else:
+        first_lo, first_hi, second_lo, second_hi = node.lo, node.lo + cut, node.lo + cut, node.hi
+    rest = RopeNode(
+        node.crates, second_lo, second_hi, node.priority, right=node.right, backwards=node.backwards
+    )
+    node.lo, node.hi, node.right = first_lo, first_hi, None
+    node.update()
+    return node, rest
+
+
+def rope_merge(first: RopeNode | None, second: RopeNode | None) -> RopeNode | None:
+    """Concatenates two ropes, the second one going on top of the first, in O(log n)."""
+    if first is None or second is None:
+        return first or second
+    if first.priority > second.priority:
+        first.push()
+        first.right = rope_merge(first.right, second)
+        first.update()
+        return first
+    second.push()
+    second.left = rope_merge(first, second.left)
+    second.update()
+    return second
+
+
+class RopeStack:
+    """Stack of crates as a rope of runs, where moving any number of crates is a split and a merge."""
+
+    __slots__ = ("root",)
+
+    def __init__(self, crates: str = ""):
+        self.root = RopeNode(crates, 0, len(crates), random.random()) if crates else None
+
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    def __str__(self) -> str:
+        """The crates from the bottom to the top of the stack, like in load_crates_positions."""
+        runs = []
+        stack, node = [], self.root
+        while stack or node is not None:  # iterative in-order traversal
+            while node is not None:
+                node.push()
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            run = node.crates[node.lo : node.hi]
+            runs.append(run[::-1] if node.backwards else run)
+            node = node.right
+        return "".join(runs)
+
+    def take(self, quantity: int) -> RopeNode | None:
+        """Removes the top quantity crates and returns them as a rope."""
+        self.root, taken = rope_split(self.root, len(self) - quantity)
+        return taken
+
+    def put(self, crates: RopeNode | None, reverse: bool = False) -> None:
+        """Places the crates on top of the stack, in reverse order if asked to."""
+        if crates is not None and reverse:
+            crates.flipped = not crates.flipped
+        self.root = rope_merge(self.root, crates)
+
+    def top(self) -> str:
+        """Returns the crate on top of the stack."""
+        if self.root is None:
+            raise IndexError("top of an empty stack")
+        node = self.root
+        node.push()
+        while node.right is not None:
+            node = node.right
+            node.push()
+        return node.crates[node.lo] if node.backwards else node.crates[node.hi - 1]
+
+
+def load_crate_ropes(input_lines: list[str]) -> dict[int, RopeStack]:
+    """Same as load_crates_positions but each stack is a RopeStack."""
+    return {idx: RopeStack(stack) for idx, stack in load_crates_positions(input_lines).items()}
+
+
+def rope_move(stacks: dict[int, RopeStack], instruction: str, multiple: bool = False) -> dict[int, RopeStack]:
+    """
+    Does the move instruction in place in O(log n), whatever the quantity: with multiple=False the
+    crates are moved one at a time (Part 1) so they land reversed, with multiple=True all at once (Part 2).
+    """
+    quantity, start_position, end_position = parse_move_instruction(instruction)
+    stacks[end_position].put(stacks[start_position].take(quantity), reverse=not multiple)
+    return stacks
+
+
+# ----- Back-Tracing Top Crates ----- #
+
+
+def trace_top_crates(
+    stacks: dict[int, str], moves: list[tuple[int, int, int]], multiple: bool = False
+) -> str:
+    """
+    Returns the crates on top of each stack after the parsed moves (from parse_move_instruction), without
+    simulating any crate. Each final top position is followed backwards through the moves to the crate
+    it started as, in O(moves x stacks) no matter how many crates there are. Empty stacks are skipped.
+    """
+    final_heights = {idx: len(stack) for idx, stack in stacks.items()}
+    for quantity, start_position, end_position in moves:
+        final_heights[start_position] -= quantity
+        final_heights[end_position] += quantity
+
+    tops = ""
+    for idx in stacks:
+        if final_heights[idx] == 0:
+            continue
+        heights = dict(final_heights)
+        stack, position = idx, final_heights[idx] - 1  # position counted from the bottom of the stack
+        for quantity, start_position, end_position in reversed(moves):
+            heights[start_position] += quantity  # heights before this move
+            heights[end_position] -= quantity
+            if stack == end_position and position >= heights[end_position]:  # crate was moved here
+                rank = position - heights[end_position]  # from the bottom of the moved crates
+                if not multiple:  # moved one at a time, so they landed in reverse order
+                    rank = quantity - 1 - rank
+                stack, position = start_position, heights[start_position] - quantity + rank
+        tops += stacks[stack][position]
+    return tops
+
+
+# ----- Time-Travel Queries ----- #
+
+
+@dataclass
+class CraneHistory:
+    """
+    Simulates the moves once, storing the stacks every checkpoint_every moves as compact strings. The
+    state after any move is then found by replaying from the nearest checkpoint at or before it.
+    """
+
+    stacks: dict[int, str]
+    moves: list[str]
+    multiple: bool = False  # False for the CrateMover 9000, True for the CrateMover 9001
+    checkpoint_every: int = 100
+    checkpoints: list[dict[int, str]] = field(init=False)
+
+    def __post_init__(self):
+        self.checkpoints = [dict(self.stacks)]
+        state = {idx: list(stack) for idx, stack in self.stacks.items()}
+        for done, instruction in enumerate(self.moves, 1):
+            crane_move(state, instruction, multiple=self.multiple)
+            if done % self.checkpoint_every == 0:
+                self.checkpoints.append({idx: "".join(stack) for idx, stack in state.items()})
+
+    def state_after(self, move_number: int) -> dict[int, str]:
+        """Returns the stacks after the given number of moves (0 for the starting stacks)."""
+        if not 0 <= move_number <= len(self.moves):
+            raise IndexError(f"move_number should be between 0 and {len(self.moves)}")
+        checkpoint = move_number // self.checkpoint_every
+        state = {idx: list(stack) for idx, stack in self.checkpoints[checkpoint].items()}
+        for instruction in self.moves[checkpoint * self.checkpoint_every : move_number]:
+            crane_move(state, instruction, multiple=self.multiple)
+        return {idx: "".join(stack) for idx, stack in state.items()}
+
+    def tops_after(self, move_number: int) -> str:
+        """Returns the crates on top of each (non-empty) stack after the given number of moves."""
+        return "".join(stack[-1] for stack in self.state_after(move_number).values() if stack)
+
+
 # ----- Running ----- #
 
 if __name__ == "__main__":
     inputs = Path("input.txt").read_text().splitlines()
-    stacks = load_crates_positions(inputs)
     moves = [line for line in inputs if line.startswith("move")]
 
     # Part 1
-    final_string = ""
+    stacks = load_crate_lists(inputs)
     for instruction in moves:
-        stacks = move(stacks, instruction)
-    for crate in stacks.values():
-        final_string += crate[-1]  # get the one on top
-    print(f"Part 1: {final_string}")
+        crane_move(stacks, instruction)
+    print(f"Part 1: {''.join(stack[-1] for stack in stacks.values())}")  # get the ones on top
 
     # Part 2
-    stacks = load_crates_positions(inputs)  # reset the stacks
-    final_string = ""
+    stacks = load_crate_lists(inputs)  # reset the stacks
     for instruction in moves:
-        stacks = move_part2(stacks, instruction)
-    for crate in stacks.values():
-        final_string += crate[-1]  # get the one on top
-    print(f"Part 2: {final_string}")
+        crane_move(stacks, instruction, multiple=True)
+    print(f"Part 2: {''.join(stack[-1] for stack in stacks.values())}")  # get the ones on top
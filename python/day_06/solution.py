@@ -57,7 +57,14 @@ Here are the first positions of start-of-message markers for all of the above ex
 
 How many characters need to be processed before the first start-of-message marker is detected?
 """
+import asyncio
+
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
 
 
 def all_different(elements: str) -> bool:
@@ -65,21 +72,183 @@ def all_different(elements: str) -> bool:
     return len(set(elements)) == len(elements)
 
 
+# ----- Sliding Window ----- #
+
+
+def first_marker(buffer: str, window: int) -> int | None:
+    """
+    Returns the number of characters processed when the first marker of `window` all different characters
+    is complete, or None if there is none. Keeps the count of each symbol in the window and how many
+    symbols appear more than once, so each character is handled in O(1) whatever the window size.
+    """
+    counts = defaultdict(int)
+    duplicates = 0  # number of symbols appearing more than once in the window
+    for i, symbol in enumerate(buffer):
+        counts[symbol] += 1
+        if counts[symbol] == 2:
+            duplicates += 1
+        if i >= window:  # the oldest symbol leaves the window
+            leaving = buffer[i - window]
+            counts[leaving] -= 1
+            if counts[leaving] == 1:
+                duplicates -= 1
+        if i >= window - 1 and duplicates == 0:
+            return i + 1
+    return None
+
+
+def first_markers(buffer: str, windows: Iterable[int]) -> dict[int, int | None]:
+    """
+    Returns the first marker position (as in first_marker) for each of the window sizes, in a single pass.
+    A window of size k ending at a character is a marker exactly when the longest run of all different
+    characters ending there is at least k long, and that run is tracked with last-seen positions.
+    """
+    pending = sorted(set(windows))  # smaller windows are always found first
+    markers = dict.fromkeys(pending)
+    last_seen = {}
+    run_start = 0  # start of the longest run of all different characters ending at i
+    for i, symbol in enumerate(buffer):
+        if not pending:
+            break
+        run_start = max(run_start, last_seen.get(symbol, -1) + 1)
+        last_seen[symbol] = i
+        while pending and pending[0] <= i - run_start + 1:
+            markers[pending.pop(0)] = i + 1
+    return markers
+
+
+# ----- Streaming ----- #
+
+
+@dataclass
+class MarkerDetector:
+    """
+    Incremental marker detection for a given window size, fed the datastream one chunk at a time. Its
+    state (last position of each symbol and the start of the current all-different run) is carried
+    over from chunk to chunk, and only depends on the alphabet size, not on the stream length.
+    """
+
+    window: int
+    processed: int = 0  # number of characters received so far
+    run_start: int = 0  # absolute start of the longest all-different run ending at the last character
+    last_seen: dict[int | str, int] = field(default_factory=dict)
+    first: int | None = None  # offset of the first marker, once found
+
+    def feed(self, chunk: bytes | str) -> list[int]:
+        """Processes the next chunk, returns the absolute offsets of all markers completed within it."""
+        markers = []
+        for position, symbol in enumerate(chunk, self.processed):
+            self.run_start = max(self.run_start, self.last_seen.get(symbol, -1) + 1)
+            self.last_seen[symbol] = position
+            if position - self.run_start + 1 >= self.window:
+                markers.append(position + 1)
+        self.processed += len(chunk)
+        if markers and self.first is None:
+            self.first = markers[0]
+        return markers
+
+
+def stream_markers(path: Path, window: int, chunk_size: int = 1 << 20, every: bool = False) -> Iterator[int]:
+    """
+    Reads the datastream (first line of the file) in fixed-size byte chunks and yields the absolute offset
+    of the first marker, or of every marker if asked to. Memory use only depends on the chunk size.
+    """
+    detector = MarkerDetector(window)
+    with Path(path).open("rb") as file:
+        while chunk := file.read(chunk_size):
+            end_of_line = chunk.find(b"\n")
+            if end_of_line != -1:  # the datastream is over
+                chunk = chunk[:end_of_line]
+            for marker in detector.feed(chunk):
+                yield marker
+                if not every:
+                    return
+            if end_of_line != -1:
+                return
+
+
+def stream_first_marker(path: Path, window: int, chunk_size: int = 1 << 20) -> int | None:
+    """Returns the offset of the first marker in the file, streaming it in chunks."""
+    return next(stream_markers(path, window, chunk_size), None)
+
+
+# ----- Concurrent Streams ----- #
+
+marker_windows = {"start-of-packet": 4, "start-of-message": 14}
+
+
+async def watch_stream(
+    name: str,
+    reader: asyncio.StreamReader,
+    on_marker: Callable[[str, str, int], None] | None = None,
+    chunk_size: int = 4096,
+) -> dict[str, int | None]:
+    """
+    Reads a device's datastream as it arrives, with a MarkerDetector per marker kind. If given, on_marker
+    is called as on_marker(name, kind, offset) as soon as each marker is found, and reading stops once all
+    markers are found, at the end of the datastream's line or when the device closes the stream.
+    """
+    detectors = {kind: MarkerDetector(window) for kind, window in marker_windows.items()}
+
+    while any(detector.first is None for detector in detectors.values()):
+        chunk = await reader.read(chunk_size)
+        if not chunk:  # stream closed
+            break
+        end_of_line = chunk.find(b"\n")
+        for kind, detector in detectors.items():
+            if detector.first is None and detector.feed(chunk[:end_of_line] if end_of_line != -1 else chunk):
+                if on_marker is not None:
+                    on_marker(name, kind, detector.first)
+        if end_of_line != -1:
+            break
+    return {kind: detector.first for kind, detector in detectors.items()}
+
+
+async def watch_streams(
+    readers: dict[str, asyncio.StreamReader], on_marker: Callable[[str, str, int], None] | None = None
+) -> dict[str, dict[str, int | None]]:
+    """Watches many device streams concurrently, returns the markers found in each of them."""
+    results = await asyncio.gather(
+        *(watch_stream(name, reader, on_marker) for name, reader in readers.items())
+    )
+    return dict(zip(readers, results))
+
+
+# ----- Vectorized ----- #
+
+
+def window_distinct_counts(data: np.ndarray, window: int) -> np.ndarray:
+    """
+    Returns the number of distinct symbols in each window of the uint8 datastream, the i-th value being
+    for the window ending with character i + window. Uses a cumulative occurrence table of each symbol,
+    restricted to the symbols actually present in the stream.
+    """
+    symbols, codes = np.unique(data, return_inverse=True)
+    occurrences = np.zeros((data.size + 1, symbols.size), dtype=np.int32)
+    occurrences[np.arange(1, data.size + 1), codes] = 1
+    np.cumsum(occurrences, axis=0, out=occurrences)
+    in_window = occurrences[window:] - occurrences[:-window]  # count of each symbol in each window
+    return np.count_nonzero(in_window, axis=1)
+
+
+def vectorized_first_marker(buffer: bytes, window: int) -> int | None:
+    """Returns the first marker position (as in first_marker) without per-position Python work."""
+    data = np.frombuffer(buffer.split(b"\n", 1)[0], dtype=np.uint8)
+    if data.size < window:
+        return None
+    is_marker = window_distinct_counts(data, window) == window
+    first = int(np.argmax(is_marker))
+    return first + window if is_marker[first] else None
+
+
+def vectorized_first_markers(captures: Iterable[bytes], window: int) -> list[int | None]:
+    """Returns the first marker position of each of the captures, for batch analysis."""
+    return [vectorized_first_marker(capture, window) for capture in captures]
+
+
 # ----- Running ----- #
 
 if __name__ == "__main__":
     buffer = Path("input.txt").read_text().splitlines()[0]
-
-    # Part 1
-    for i in range(4, len(buffer) - 1):
-        content = buffer[i - 4 : i]
-        if all_different(content):
-            break
-    print(f"Part 1: {i}")
-
-    # Part 2 - this is the same but with 14 characters
-    for i in range(14, len(buffer) - 1):
-        content = buffer[i - 14 : i]
-        if all_different(content):
-            break
-    print(f"Part 2: {i}")
+    print(f"Part 1: {first_marker(buffer, 4)}")
+    print(f"Part 2: {first_marker(buffer, 14)}")